@@ -1,4 +1,7 @@
 import os
+import atexit
+import shutil
+import threading
 import yt_dlp
 import logging
 import asyncio
@@ -14,50 +17,112 @@ with open('config.json', 'r') as config_file:
     config = json.load(config_file)
 
 class Downloader:
-    def __init__(self, output_dir="downloads", video_format="bestvideo[height<=1080]+bestaudio/best"):
+    def __init__(self, output_dir="downloads", video_format="bestvideo[height<=1080]+bestaudio/best", concurrent_fragments=8):
         self.output_dir = output_dir
         self.video_format = video_format
+        self.concurrent_fragments = concurrent_fragments
         os.makedirs(self.output_dir, exist_ok=True)
 
-    async def get_channel_videos(self, channel_url, limit):
-        """Retrieve video metadata from a YouTube channel or playlist."""
-        logger.info("Retrieving videos from channel URL...")
-        ydl_opts = {
-            # 'format': self.video_format,
+        self._download_opts = {
+            'format': self.video_format,
             'outtmpl': os.path.join(self.output_dir, '%(id)s', '%(title)s.%(ext)s'),
-            'playlistend': limit,
             'quiet': False,
-            'extract_flat': True,  # Only retrieve metadata, don't download videos
+            'concurrent_fragment_downloads': self.concurrent_fragments,
         }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            channel_info = ydl.extract_info(channel_url, download=False)
-            return channel_info['entries'] if 'entries' in channel_info else [channel_info]
+        # Use aria2c's multi-connection downloads when it is installed
+        if shutil.which('aria2c'):
+            self._download_opts['external_downloader'] = 'aria2c'
+            self._download_opts['external_downloader_args'] = {'aria2c': ['-x', '16', '-s', '16', '-k', '1M']}
+
+        # YoutubeDL instances are reused across calls; download instances are
+        # per worker thread since yt-dlp is not thread-safe
+        self._ydl_flat = {}
+        self._local = threading.local()
+        self._ydl_instances = []
+        self._ydl_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def close(self):
+        """Close every cached YoutubeDL instance."""
+        with self._ydl_lock:
+            for ydl in self._ydl_instances:
+                ydl.close()
+            self._ydl_instances.clear()
+            self._ydl_flat.clear()
+        self._local = threading.local()
+
+    def _track(self, ydl):
+        """Remember an instance so close() can release it."""
+        with self._ydl_lock:
+            self._ydl_instances.append(ydl)
+        return ydl
+
+    def _flat_ydl(self, limit):
+        """Metadata-only YoutubeDL, one per playlist limit."""
+        if limit not in self._ydl_flat:
+            self._ydl_flat[limit] = self._track(yt_dlp.YoutubeDL({
+                # 'format': self.video_format,
+                'outtmpl': os.path.join(self.output_dir, '%(id)s', '%(title)s.%(ext)s'),
+                'playlistend': limit,
+                'quiet': False,
+                'extract_flat': True,  # Only retrieve metadata, don't download videos
+            }))
+        return self._ydl_flat[limit]
+
+    def _download_ydl(self):
+        """Downloading YoutubeDL for the current worker thread."""
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            ydl = self._local.ydl = self._track(yt_dlp.YoutubeDL(self._download_opts))
+        return ydl
+
+    def _download_sync(self, url):
+        """Blocking download, returns the info dict and the output path."""
+        ydl = self._download_ydl()
+        info = ydl.extract_info(url, download=True)
+        return info, ydl.prepare_filename(info)
+
+    async def get_channel_videos(self, channel_url, limit):
+        """Retrieve video metadata from a YouTube channel or playlist."""
+        logger.info("Retrieving videos from channel URL...")
+        ydl = self._flat_ydl(limit)
+        channel_info = await asyncio.to_thread(ydl.extract_info, channel_url, download=False)
+        return channel_info['entries'] if 'entries' in channel_info else [channel_info]
         
     async def download_video(self, video_info):
         """Download a single video using yt-dlp."""
         try:
-            ydl_opts = {
-                'format': self.video_format,
-                'outtmpl': os.path.join(self.output_dir, '%(id)s', '%(title)s.%(ext)s'),
-                'quiet': False,
+            # yt-dlp blocks, so run it in a worker thread to let other downloads progress
+            info, video_path = await asyncio.to_thread(self._download_sync, video_info['url'])
+            description = f"{info['title']} {info.get('channel', '')} {info.get('description', '')[-1800:]}"
+            duration = info['duration']
+            title = f"{info['title']}"
+            return {
+                'video_path': video_path,
+                'title': title,
+                'description': description,
+                'duration': duration,
             }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_info['url'], download=True)
-                video_path = ydl.prepare_filename(info)
-                description = f"{info['title']} {info.get('channel', '')} {info.get('description', '')[-1800:]}"
-                duration = info['duration']
-                title = f"{info['title']}"
-                return {
-                    'video_path': video_path,
-                    'title': title,
-                    'description': description,
-                    'duration': duration,
-                }
         except Exception as e:
             logger.error(f"Error downloading video '{video_info.get('title', 'Unknown')}': {str(e)}")
             return None
 
 
+    async def process_downloads(self, videos, handler, prefetch=3):
+        """Download each video and await handler(video, result) on it, with at most
+        `prefetch` videos between download start and handler completion."""
+        semaphore = asyncio.Semaphore(prefetch)
+
+        async def download_and_handle(video):
+            # The slot is held until the handler is done, not just the download
+            async with semaphore:
+                await handler(video, await self.download_video(video))
+
+        async with asyncio.TaskGroup() as tg:
+            for video in videos:
+                tg.create_task(download_and_handle(video))
+
+
 async def download_videos_from_channel(channel_url, num_videos):
     
 
@@ -69,14 +134,13 @@ async def download_videos_from_channel(channel_url, num_videos):
     # Get video metadata for the specified number of videos
     videos_metadata = await downloader.get_channel_videos(channel_url, limit=num_videos)
     
-    # Define an async download task for each video
-    download_tasks = [
-        downloader.download_video(video)
-        for video in videos_metadata
-    ]
-    
-    # Run download tasks concurrently and collect results
-    downloaded_videos = await asyncio.gather(*download_tasks)
+    # Download a few videos at a time and collect results as they finish
+    downloaded_videos = []
+
+    async def collect(_, downloaded_video):
+        downloaded_videos.append(downloaded_video)
+
+    await downloader.process_downloads(videos_metadata, collect)
 
     # Filter out any None results from failed downloads and create the output dictionary
     return [
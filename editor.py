@@ -1,49 +1,319 @@
 # editor.py
 import os
+import math
+import hashlib
 import asyncio
 import logging
-from typing import List, Dict, Coroutine
+from typing import List, Dict, Coroutine, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from uploader import Uploader
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_WIDTH, OUTPUT_HEIGHT = 1280, 720
+
 class Editor:
+    # CPU text filtergraph, only the textfile paths change between videos
+    _DRAWTEXT_FILTER = (
+        f"scale={OUTPUT_WIDTH}:{OUTPUT_HEIGHT},"
+        "drawtext=textfile='{main_file}':reload=0:"
+        "fontsize=70:fontcolor=white:font='Arial-Bold':"
+        "borderw=1:bordercolor=black:x=(w-text_w)/2:y=h*0.08,"
+        "drawtext=textfile='{part_file}':reload=0:"
+        "fontsize=60:fontcolor=white:font='Arial-Bold':"
+        "borderw=1:bordercolor=black:x=(w-text_w)/2:y=h-h*0.08-60"
+    )
+
+    # Encoders and filters each method's pipeline uses beyond the hwaccel itself
+    _REQUIRED_COMPONENTS = {
+        "cuda": {"h264_nvenc", "scale_cuda", "overlay_cuda"},
+    }
+
     def __init__(
         self,
         cookies_file: str,
-        hw_accel: str = "cuda",
+        hw_accel: Optional[str] = "cuda",
         segment_length: int = 180,
         output_dir: str = "clips",
-        max_concurrent_tasks: int = 3
+        max_concurrent_tasks: int = 3,
+        max_concurrent_uploads: int = 3,
+        burn_text: bool = True
     ):
-        self.hw_accel = hw_accel.lower()
+        # None selects the CPU path (scale/drawtext/libx264) without probing
+        self.hw_accel = hw_accel.lower() if hw_accel else None
         self.segment_length = segment_length
         self.output_dir = output_dir
         self.max_concurrent_tasks = max_concurrent_tasks
-        self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
+        self.burn_text = burn_text
+        self.max_concurrent_uploads = max_concurrent_uploads
+        # Separate limits so slow uploads never hold an encoder slot
+        self.ffmpeg_sem = asyncio.Semaphore(max_concurrent_tasks)
+        self.upload_sem = asyncio.Semaphore(max_concurrent_uploads)
         self.uploader = Uploader(cookies_file)
+        # Rendered text overlays, keyed by (text, fontsize)
+        self._text_cache: Dict[Tuple[str, int], Image.Image] = {}
+        # drawtext textfiles, keyed by their escaped content
+        self._textfile_cache: Dict[str, str] = {}
+        # Method that actually works on this host, probed on first use
+        self._effective_hwaccel: Optional[str] = None
+        self._hwaccel_probed = False
+        # Cleared by the probe on GPUs that cannot use B-frames as references
+        self._nvenc_b_frames = True
+        self._hwaccel_lock = asyncio.Lock()
+        # FFmpeg arguments shared by every run; decode/encode ones are filled
+        # in once the effective hwaccel is known
+        self._decode_args: Tuple[str, ...] = ()
+        self._encode_args: Tuple[str, ...] = ()
+        self._copy_args = (
+            '-map', '0',
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+        )
+        self._segment_args = (
+            '-f', 'segment',
+            '-segment_time', str(segment_length),
+            '-segment_start_number', '1',
+            '-reset_timestamps', '1',
+            '-y',
+        )
         self._validate_hw_accel()
         
         os.makedirs(self.output_dir, exist_ok=True)
-        logger.info(f"Initialized Editor with {hw_accel} acceleration")
+        logger.info(f"Initialized Editor with {hw_accel or 'CPU'} acceleration")
 
     def _validate_hw_accel(self):
         valid_methods = ["vdpau", "cuda", "vaapi", "qsv", "drm", "opencl", "vulkan"]
-        if self.hw_accel not in valid_methods:
+        if self.hw_accel is not None and self.hw_accel not in valid_methods:
             raise ValueError(f"Invalid HW acceleration. Choose from: {', '.join(valid_methods)}")
 
-    async def _segment_exists(self, output_path: str, expected_duration: float) -> bool:
-        """Check if valid segment exists"""
-        try:
-            if not os.path.exists(output_path):
-                return False
+    @staticmethod
+    async def _ffmpeg_listing(option: str) -> str:
+        """Output of an ffmpeg listing option such as -hwaccels or -encoders"""
+        proc = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-hide_banner', option,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
+        return stdout.decode()
 
-            actual_duration = await self._get_video_duration(output_path)
-            return abs(actual_duration - expected_duration) < 1.0
-            
-        except Exception as e:
-            logger.warning(f"Segment check failed: {str(e)}")
-            return False
+    async def _probe_hwaccel(self) -> Optional[str]:
+        """First method FFmpeg can initialise: configured one, then vaapi, then qsv"""
+        # First line is the "Hardware acceleration methods:" header
+        available = set((await self._ffmpeg_listing('-hwaccels')).split()[3:])
+        # The name is the second column of -encoders and -filters listings
+        components = {
+            line.split()[1]
+            for option in ('-encoders', '-filters')
+            for line in (await self._ffmpeg_listing(option)).splitlines()
+            if len(line.split()) > 1
+        }
+
+        for method in dict.fromkeys([self.hw_accel, "vaapi", "qsv"]):
+            if method not in available:
+                continue
+            # The CUDA path also needs NVENC and the CUDA filters
+            missing = self._REQUIRED_COMPONENTS.get(method, set()) - components
+            if missing:
+                logger.warning(f"{method} skipped, FFmpeg lacks {', '.join(sorted(missing))}")
+                continue
+            if method == "cuda":
+                # A working device is not enough, run the real upload, scale and NVENC
+                # encode; pre-Turing GPUs reject B-frame references, so retry without
+                for b_frames in (True, False):
+                    if await self._trial_run([
+                        '-init_hw_device', 'cuda=hw',
+                        '-filter_hw_device', 'hw',
+                        '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                        '-vf', 'format=yuv420p,hwupload,scale_cuda=256:256',
+                        *self._encoder_args(method, b_frames),
+                    ]):
+                        self._nvenc_b_frames = b_frames
+                        return method
+            elif await self._trial_run([
+                '-init_hw_device', f"{method}=hw",
+                '-f', 'lavfi', '-i', 'color=black:d=0.1',
+            ]):
+                return method
+            logger.warning(f"{method} trial run failed")
+        return None
+
+    @staticmethod
+    async def _trial_run(trial_args: List[str]) -> bool:
+        """Run a short FFmpeg job to the null muxer, True if it exits 0"""
+        proc = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            *trial_args,
+            '-f', 'null', '-',
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        return await proc.wait() == 0
+
+    async def _resolve_hwaccel(self) -> Optional[str]:
+        """Probe once and cache the effective method, None for CPU"""
+        async with self._hwaccel_lock:
+            if not self._hwaccel_probed:
+                if self.hw_accel is not None:
+                    self._effective_hwaccel = await self._probe_hwaccel()
+                    if self._effective_hwaccel != self.hw_accel:
+                        logger.warning(
+                            f"{self.hw_accel} acceleration unavailable, using "
+                            f"{self._effective_hwaccel or 'CPU'}"
+                        )
+                self._decode_args = tuple(self._hwaccel_args())
+                self._encode_args = (
+                    # Keyframe at every cut so parts split exactly on segment_length
+                    '-force_key_frames', f"expr:gte(t,n_forced*{self.segment_length})",
+                    *self._encoder_args(self._effective_hwaccel, self._nvenc_b_frames),
+                    '-c:a', 'aac',
+                    '-b:a', '128k',
+                    '-segment_format_options', 'movflags=+faststart',
+                )
+                self._hwaccel_probed = True
+        return self._effective_hwaccel
+
+    def _hwaccel_args(self) -> List[str]:
+        """Decoder flags; CUDA keeps decoded frames in GPU memory"""
+        if self._effective_hwaccel == "cuda":
+            return [
+                '-hwaccel', 'cuda',
+                '-hwaccel_output_format', 'cuda',
+                '-extra_hw_frames', '2',
+            ]
+        if self._effective_hwaccel:
+            return ['-hwaccel', self._effective_hwaccel]
+        return []
+
+    @staticmethod
+    def _escape_drawtext(text: str) -> str:
+        """Escape backslashes and % so drawtext expansion prints text literally"""
+        return text.replace('\\', '\\\\').replace('%', '\\%')
+
+    def _textfile(self, text: str) -> str:
+        """Write drawtext content to a file once, return its path"""
+        if text not in self._textfile_cache:
+            digest = hashlib.sha1(text.encode()).hexdigest()[:12]
+            path = os.path.join(self.output_dir, f"drawtext_{digest}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self._textfile_cache[text] = path
+        return self._textfile_cache[text]
+
+    def _build_filter(self, main_text: str, total_parts: int) -> str:
+        """Scale and draw text on CPU frames"""
+        main_file = self._textfile(self._escape_drawtext(main_text[:2200]))
+        # Part number is evaluated per frame, so one filtergraph covers every part
+        part_file = self._textfile(
+            f"Part %{{eif:floor(t/{self.segment_length})+1:d}}/{total_parts}"
+        )
+        return self._DRAWTEXT_FILTER.format_map({
+            'main_file': main_file,
+            'part_file': part_file,
+        })
+
+    @staticmethod
+    def _load_font(fontsize: int) -> ImageFont.FreeTypeFont:
+        """First available bold font, Pillow's default font otherwise"""
+        for name in ("Arial Bold.ttf", "arialbd.ttf", "DejaVuSans-Bold.ttf"):
+            try:
+                return ImageFont.truetype(name, fontsize)
+            except OSError:
+                continue
+        return ImageFont.load_default(size=fontsize)
+
+    def _render_text(self, text: str, fontsize: int) -> Image.Image:
+        """Render white bordered text on a transparent background"""
+        key = (text, fontsize)
+        if key not in self._text_cache:
+            font = self._load_font(fontsize)
+            left, top, right, bottom = font.getbbox(text, stroke_width=1)
+            # yuva420p needs even dimensions
+            width = (right - left + 1) // 2 * 2
+            height = (bottom - top + 1) // 2 * 2
+            image = Image.new('RGBA', (max(width, 2), max(height, 2)), (0, 0, 0, 0))
+            ImageDraw.Draw(image).text(
+                (-left, -top), text, font=font,
+                fill='white', stroke_width=1, stroke_fill='black'
+            )
+            # Long titles overflow the frame like drawtext does, keep the centre
+            if image.width > OUTPUT_WIDTH:
+                offset = (image.width - OUTPUT_WIDTH) // 2
+                image = image.crop((offset, 0, offset + OUTPUT_WIDTH, image.height))
+            self._text_cache[key] = image
+        return self._text_cache[key]
+
+    def _overlay_args(
+        self,
+        output_folder: str,
+        main_text: str,
+        total_parts: int
+    ) -> List[str]:
+        """Pre-rendered text inputs composited on the GPU with overlay_cuda"""
+        main_png = os.path.join(output_folder, 'label_main.png')
+        main_image = self._render_text(main_text[:2200], 70)
+        main_image.save(main_png)
+
+        # One label per part, shown for segment_length seconds each
+        labels = [
+            self._render_text(f"Part {part_num}/{total_parts}", 60)
+            for part_num in range(1, total_parts + 1)
+        ]
+        # Every frame of an image sequence must share one size
+        label_size = (
+            max(label.width for label in labels),
+            max(label.height for label in labels)
+        )
+        for part_num, label in enumerate(labels, start=1):
+            canvas = Image.new('RGBA', label_size, (0, 0, 0, 0))
+            canvas.paste(label, ((label_size[0] - label.width) // 2, 0))
+            canvas.save(os.path.join(output_folder, f'label_part_{part_num}.png'))
+
+        margin = int(OUTPUT_HEIGHT * 0.08)
+        main_x = (OUTPUT_WIDTH - main_image.width) // 2
+        part_x = (OUTPUT_WIDTH - label_size[0]) // 2
+        part_y = OUTPUT_HEIGHT - label_size[1] - margin
+        return [
+            '-i', main_png,
+            '-framerate', f"1/{self.segment_length}",
+            '-start_number', '1',
+            '-i', os.path.join(output_folder, 'label_part_%d.png'),
+            '-filter_complex', (
+                f"[1:v]format=yuva420p,hwupload_cuda[t1];"
+                f"[2:v]format=yuva420p,hwupload_cuda[t2];"
+                f"[0:v]scale_cuda={OUTPUT_WIDTH}:{OUTPUT_HEIGHT}:format=yuv420p[v];"
+                f"[v][t1]overlay_cuda=x={main_x}:y={margin}[v1];"
+                f"[v1][t2]overlay_cuda=x={part_x}:y={part_y}[vout]"
+            ),
+            '-map', '[vout]',
+            '-map', '0:a?',
+        ]
+
+    def _encoder_args(self, method: Optional[str], b_frames: bool = True) -> List[str]:
+        """NVENC for cuda, libx264 for decode-only methods and CPU"""
+        if method == "cuda":
+            return [
+                '-c:v', 'h264_nvenc',
+                '-preset', 'p4',
+                '-tune', 'hq',
+                '-rc', 'vbr',
+                '-cq', '23',
+                '-b:v', '4M',
+                '-maxrate', '6M',
+                '-bufsize', '8M',
+                # Three B-frames, only the middle one used as a reference
+                *(['-bf', '3', '-b_ref_mode', 'middle'] if b_frames else []),
+                '-spatial_aq', '1',
+                '-forced-idr', '1',
+            ]
+        return [
+            '-c:v', 'libx264',
+            '-preset', 'veryfast',
+        ]
 
     async def _get_video_duration(self, video_path: str) -> float:
         """Get duration using ffprobe"""
@@ -51,7 +321,7 @@ class Editor:
             'ffprobe',
             '-v', 'error',
             '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
+            '-print_format', 'json',
             video_path
         ]
         proc = await asyncio.create_subprocess_exec(
@@ -60,7 +330,21 @@ class Editor:
             stderr=asyncio.subprocess.PIPE
         )
         stdout, _ = await proc.communicate()
-        return float(stdout.decode().strip())
+        return float(json_loads(stdout)['format']['duration'])
+
+    async def _probe_multiple(self, paths: List[str]) -> Dict[str, float]:
+        """Probe durations concurrently, paths that fail to probe are left out"""
+        results = await asyncio.gather(
+            *(self._get_video_duration(path) for path in paths),
+            return_exceptions=True
+        )
+        durations = {}
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Segment check failed: {str(result)}")
+            else:
+                durations[path] = result
+        return durations
 
     async def _log_stream(self, stream, logger_func):
         """Real-time FFmpeg logging"""
@@ -70,118 +354,182 @@ class Editor:
                 break
             logger_func(line.decode().strip())
 
-    async def _process_segment(
-        self,
-        video_path: str,
-        start: float,
-        duration: float,
-        main_text: str,
-        part_info: str,
-        output_path: str,
-        description: str
-    ) -> str:
-        """Process video segment with GPU acceleration"""
-        async with self.semaphore:
-            try:
-                # Check existing segment
-                if await self._segment_exists(output_path, duration):
-                    logger.info(f"Reusing existing segment: {output_path}")
-                    return await self.uploader.upload(output_path, description)
-
-                # FFmpeg GPU command setup
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-loglevel', 'verbose',
-                    '-hwaccel', 'cuda',
-                    '-hwaccel_output_format', 'cuda',
-                    '-extra_hw_frames', '2',
-                    '-ss', str(start),
-                    '-i', video_path,
-                    '-t', str(duration),
-                    '-vf', (
-                        f"format=yuv420p,"
-                        f"scale_cuda=1280:720,"
-                        f"drawtext=text='{main_text[:2200]}':"
-                        f"fontsize=70:fontcolor=white:font='Arial-Bold':"
-                        f"borderw=1:bordercolor=black:x=(w-text_w)/2:y=h*0.08,"
-                        f"drawtext=text='{part_info}':"
-                        f"fontsize=60:fontcolor=white:font='Arial-Bold':"
-                        f"borderw=1:bordercolor=black:x=(w-text_w)/2:y=h-h*0.08-60"
-                    ),
-                    '-c:v', 'libx264',
-                    '-preset', 'veryfast',
-                    '-movflags', '+faststart',
-                    '-c:a', 'aac',
-                    '-b:a', '128k',
-                    '-y',
-                    output_path
-                ]
-
-                # Execute FFmpeg
-                proc = await asyncio.create_subprocess_exec(
-                    *ffmpeg_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
+    async def _run_ffmpeg(self, ffmpeg_cmd: List[str]):
+        """Run FFmpeg, streaming its output only when debug logging is on"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            # With -loglevel error stderr is short, read it once at exit
+            proc = await asyncio.create_subprocess_exec(
+                *ffmpeg_cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                logger.error(stderr.decode().strip())
+                raise RuntimeError(f"FFmpeg failed with code {proc.returncode}")
+            return
 
-                # Logging
-                stdout_task = asyncio.create_task(self._log_stream(proc.stdout, logger.debug))
-                stderr_task = asyncio.create_task(self._log_stream(proc.stderr, logger.info))
+        proc = await asyncio.create_subprocess_exec(
+            *ffmpeg_cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        # Logging
+        stdout_task = asyncio.create_task(self._log_stream(proc.stdout, logger.debug))
+        stderr_task = asyncio.create_task(self._log_stream(proc.stderr, logger.debug))
 
-                await proc.wait()
-                await stdout_task
-                await stderr_task
+        await proc.wait()
+        await stdout_task
+        await stderr_task
+
+        if proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg failed with code {proc.returncode}")
+
+    def _scan_segments(self, output_folder: str) -> Dict[str, int]:
+        """Sizes of part files in the output folder, from a single directory scan"""
+        with os.scandir(output_folder) as it:
+            return {
+                entry.name: entry.stat().st_size
+                for entry in it
+                if entry.is_file() and entry.name.startswith('part_') and entry.name.endswith('.mp4')
+            }
+
+    def _list_parts(self, output_folder: str) -> List[str]:
+        """Part files in the output folder, ordered by part number"""
+        parts = sorted(
+            self._scan_segments(output_folder),
+            key=lambda name: int(name[len('part_'):-len('.mp4')])
+        )
+        return [os.path.join(output_folder, name) for name in parts]
 
-                if proc.returncode != 0:
-                    raise RuntimeError(f"FFmpeg failed with code {proc.returncode}")
+    async def _split_video(
+        self,
+        video_path: str,
+        output_folder: str,
+        main_text: str,
+        total_parts: int
+    ) -> List[str]:
+        """Write every part in one FFmpeg run with the segment muxer"""
+        if self.burn_text:
+            if await self._resolve_hwaccel() == "cuda":
+                filter_args = self._overlay_args(output_folder, main_text, total_parts)
+            else:
+                filter_args = ['-vf', self._build_filter(main_text, total_parts)]
+            codec_args = (
+                *self._decode_args,
+                '-i', video_path,
+                *filter_args,
+                *self._encode_args,
+                # yt-dlp rounds durations, stop at the part count burned into the text
+                '-t', str(total_parts * self.segment_length),
+            )
+        else:
+            codec_args = ('-i', video_path, *self._copy_args)
 
-                return await self.uploader.upload(output_path, description)
+        # Drop parts from earlier runs so they are not picked up as new ones
+        for name in self._scan_segments(output_folder):
+            os.remove(os.path.join(output_folder, name))
 
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-loglevel', 'verbose' if logger.isEnabledFor(logging.DEBUG) else 'error',
+            *codec_args,
+            *self._segment_args,
+            os.path.join(output_folder, 'part_%d.mp4')
+        ]
+        async with self.ffmpeg_sem:
+            try:
+                await self._run_ffmpeg(ffmpeg_cmd)
             except Exception as e:
                 logger.error(f"Processing failed: {str(e)}")
                 raise
             finally:
-                if os.path.exists(output_path) and os.path.getsize(output_path) == 0:
-                    os.remove(output_path)
+                for name, size in self._scan_segments(output_folder).items():
+                    if size == 0:
+                        os.remove(os.path.join(output_folder, name))
+
+        return self._list_parts(output_folder)
+
+    async def _existing_parts(
+        self,
+        output_folder: str,
+        total_duration: float,
+        total_parts: int
+    ) -> List[str]:
+        """Parts left by a previous run, empty unless all of them are valid"""
+        sizes = self._scan_segments(output_folder)
+        names = [f"part_{part_num}.mp4" for part_num in range(1, total_parts + 1)]
+        # Only probe once every expected part is present and non-empty
+        if not all(sizes.get(name) for name in names):
+            return []
+
+        parts = [os.path.join(output_folder, name) for name in names]
+        durations = await self._probe_multiple(parts)
+        for part_num, output_path in enumerate(parts, start=1):
+            start = (part_num - 1) * self.segment_length
+            expected_duration = min(self.segment_length, total_duration - start)
+            if abs(durations.get(output_path, -1.0) - expected_duration) >= 1.0:
+                return []
+        return parts
+
+    def _segments_folder(self, video_path: str, folder_name: str) -> str:
+        """Segment folder on the same filesystem as the source video"""
+        output_folder = os.path.join(self.output_dir, folder_name)
+        if os.stat(video_path).st_dev == os.stat(self.output_dir).st_dev:
+            os.makedirs(output_folder, exist_ok=True)
+            return output_folder
+
+        # Write next to the source and link it from output_dir
+        sibling_folder = os.path.join(os.path.dirname(os.path.abspath(video_path)), folder_name)
+        os.makedirs(sibling_folder, exist_ok=True)
+        if not os.path.lexists(output_folder):
+            os.symlink(sibling_folder, output_folder)
+        return sibling_folder
+
+    async def _upload_segment(self, output_path: str, description: str):
+        """Upload a finished part, gated by the upload semaphore"""
+        async with self.upload_sem:
+            return await self.uploader.upload_video(output_path, description)
+
+    @staticmethod
+    def _part_description(title: str, part_num: int, total_parts: int) -> str:
+        """Upload description with part suffix, capped at TikTok's 2200 chars"""
+        part_suffix = f" (Part {part_num}/{total_parts})"
+        clean_title = title.strip()[:2200 - len(part_suffix)]
+        return f"{clean_title}{part_suffix}"
 
     async def crop_video_to_clips(self, video: Dict) -> List[Coroutine]:
         """Generate video segments"""
         try:
             video_path = video['video_path']
-            total_duration = await self._get_video_duration(video_path)
+            # yt-dlp already reports the duration, probe only if it is missing
+            total_duration = video.get('duration') or await self._get_video_duration(video_path)
             base_name = os.path.splitext(os.path.basename(video_path))[0]
-            output_folder = os.path.join(self.output_dir, f"{base_name}_segments")
-            os.makedirs(output_folder, exist_ok=True)
+            output_folder = self._segments_folder(video_path, f"{base_name}_segments")
+
+            total_parts = math.ceil(total_duration / self.segment_length)
+            parts = []
+            if self.burn_text:
+                parts = await self._existing_parts(output_folder, total_duration, total_parts)
+                if parts:
+                    logger.info(f"Reusing existing segments: {output_folder}")
+            if not parts:
+                parts = await self._split_video(
+                    video_path, output_folder, video['title'], total_parts
+                )
 
-            tasks = []
-            for i in range(0, int(total_duration), self.segment_length):
-                start = i
-                end = min(i + self.segment_length, total_duration)
-                duration = end - start
-                part_num = (i // self.segment_length) + 1
-                total_parts = (int(total_duration) // self.segment_length) + 1
-                
-                # Format description
-                part_suffix = f" (Part {part_num}/{total_parts})"
-                clean_title = video['title'].strip()[:2200 - len(part_suffix)]
-                description = f"{clean_title}{part_suffix}"
-                
-                output_path = os.path.join(output_folder, f"part_{part_num}.mp4")
-                part_info = f"Part {part_num}/{total_parts}"
-
-                tasks.append(
-                    self._process_segment(
-                        video_path=video_path,
-                        start=start,
-                        duration=duration,
-                        main_text=video['title'],
-                        part_info=part_info,
-                        output_path=output_path,
-                        description=description
-                    )
+            # Burned text uses total_parts; stream-copy cuts land on keyframes,
+            # so there the count comes from what FFmpeg produced
+            description_parts = total_parts if self.burn_text else len(parts)
+            return [
+                self._upload_segment(
+                    part_path,
+                    self._part_description(video['title'], part_num, description_parts)
                 )
-            return tasks
-            
+                for part_num, part_path in enumerate(parts, start=1)
+            ]
+
         except Exception as e:
             logger.error(f"Video processing failed: {str(e)}")
             raise
\ No newline at end of file
@@ -1,8 +1,10 @@
 # main.py
 import asyncio
+import functools
 import logging
 import json
 import os
+import shutil
 from downloader import Downloader
 from editor import Editor
 
@@ -14,6 +16,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def process_video(editor, video, downloaded_video):
+    """Process a downloaded video and upload its segments"""
+    try:
+        if not downloaded_video:
+            return
+
+        # Process and upload segments
+        segment_tasks = await editor.crop_video_to_clips(downloaded_video)
+        await asyncio.gather(*segment_tasks)
+
+    except Exception as e:
+        logger.error(f"Error processing video {video['id']}: {str(e)}")
+
 async def main():
     # Load configuration
     with open('config.json', 'r') as config_file:
@@ -28,9 +43,12 @@ async def main():
     downloader = Downloader(output_dir=working_dir)
     editor = Editor(
         cookies_file=config['cookies_file'],
+        hw_accel=config.get('hw_accel', 'cuda'),
         segment_length=config.get('segment_length', 180),
         output_dir=working_dir,
-        max_concurrent_tasks=config.get('max_concurrent_tasks', 3)
+        max_concurrent_tasks=config.get('max_concurrent_tasks', 3),
+        max_concurrent_uploads=config.get('max_concurrent_uploads', 3),
+        burn_text=config.get('burn_text', True)
     )
 
     try:
@@ -40,34 +58,19 @@ async def main():
             limit=config.get('video_limit', 5)
         )
         
-        # Step 2: Process and upload videos
-        upload_tasks = []
-        for video in videos:
-            try:
-                # Download video
-                downloaded_video = await downloader.download_video(video)
-                if not downloaded_video:
-                    continue
-                
-                # Process and upload segments
-                segment_tasks = await editor.crop_video_to_clips(downloaded_video)
-                await asyncio.gather(*segment_tasks)
-                
-                # Cleanup original video
-                
-            except Exception as e:
-                logger.error(f"Error processing video {video['id']}: {str(e)}")
-                continue
-        
-        # Wait for all uploads to complete
-        if upload_tasks:
-            await asyncio.gather(*upload_tasks)
+        # Step 2: Download, process and upload, a few videos at a time
+        await downloader.process_downloads(
+            videos,
+            functools.partial(process_video, editor),
+            prefetch=config.get('prefetch_videos', 3)
+        )
             
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
     finally:
-        # Cleanup working directory
-    
+        # Cleanup working directory in one rmtree call, off the event loop
+        await asyncio.to_thread(shutil.rmtree, working_dir, ignore_errors=True)
+        os.makedirs(working_dir, exist_ok=True)
         logger.info("Cleanup completed")
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from tiktok_uploader.basics import eprint
 from tiktok_uploader.Config import Config
 import sys
 import os
+import asyncio
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -17,8 +18,10 @@ class Uploader:
             Config.get().cookies_dir, 
             f'tiktok_session-{users}'
         )
+        # Paths already reported missing, so the directory is listed only once
+        self._known_missing = set()
 
-    def upload_video(
+    async def upload_video(
         self, 
         video_path, 
         title, 
@@ -38,16 +41,25 @@ class Uploader:
             Config.get().videos_dir, 
             video_path
         )
-        
+
+        if not os.path.exists(video_full_path) and os.path.exists(video_path):
+            # Upload in place, e.g. segments written outside the videos dir
+            video_full_path = os.path.abspath(video_path)
+
         if not os.path.exists(video_full_path):
             print("[-] Video does not exist")
-            print("Available videos:")
-            for name in os.listdir(os.path.dirname(video_full_path)):
-                print(f'[-] {name}')
-            sys.exit(1)
+            if video_full_path not in self._known_missing and logger.isEnabledFor(logging.INFO):
+                print("Available videos:")
+                names = await asyncio.to_thread(os.listdir, os.path.dirname(video_full_path))
+                for name in names:
+                    print(f'[-] {name}')
+            self._known_missing.add(video_full_path)
+            return False
 
         try:
-            tiktok.upload_video(
+            # The TikTok client is blocking, keep it off the event loop
+            result = await asyncio.to_thread(
+                tiktok.upload_video,
                 self.users,
                 video_full_path,
                 title,
@@ -61,13 +73,23 @@ class Uploader:
                 ailabel,
                 proxy
             )
+            # tiktok.upload_video reports most failures by returning False
+            if result is False:
+                logger.error(f"Upload failed: {video_full_path}")
+                return False
             print(video_full_path + ": Finish")
-            
+            return True
+
+        except SystemExit as e:
+            # Raised by tiktok.upload_video when no session cookie is saved
+            logger.error(f"Upload aborted with exit code {e.code}: {video_full_path}")
+            return False
         except Exception as e:
             logger.error(f"Upload failed: {str(e)}")
-            sys.exit(1)
+            return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     _ = Config.load("./config.txt")
     
     parser = argparse.ArgumentParser(
@@ -213,7 +235,7 @@ if __name__ == "__main__":
             video_path = args.video
 
         uploader = Uploader(args.users)
-        uploader.upload_video(
+        uploaded = asyncio.run(uploader.upload_video(
             video_path=video_path,
             title=args.title,
             schedule=args.schedule,
@@ -225,7 +247,9 @@ if __name__ == "__main__":
             brandcontent=args.brandcontent,
             ailabel=args.ailabel,
             proxy=args.proxy
-        )
+        ))
+        if not uploaded:
+            sys.exit(1)
 
     elif args.subcommand == "show":
         if args.users: